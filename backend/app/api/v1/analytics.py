@@ -1,6 +1,10 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, Query, Request
+import orjson
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
@@ -38,6 +42,38 @@ def _parse_date_range(
     return start, end
 
 
+def _conditional_response(
+    request: Request, payload: BaseModel, etag_exclude: set[str] | None = None
+) -> Response:
+    """Serialize payload with a content-hash ETag, or answer 304 if the client has it.
+
+    Dashboards poll these endpoints; when nothing changed the client keeps its
+    cached copy and skips downloading and re-rendering the same payload.
+    Fields in ``etag_exclude`` are left out of the hash, for values that change
+    on every request without the data changing; the ETag is then weak, since
+    equal tags no longer mean byte-identical bodies. ``If-None-Match: *`` always
+    matches, as the resource exists once we get here.
+    """
+    content = payload.model_dump(mode="json")
+    response = ORJSONResponse(content)
+    if etag_exclude:
+        hashed = orjson.dumps({k: v for k, v in content.items() if k not in etag_exclude})
+    else:
+        hashed = response.body
+    opaque_tag = f'"{hashlib.sha256(hashed).hexdigest()[:32]}"'
+    etag = f"W/{opaque_tag}" if etag_exclude else opaque_tag
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    # If-None-Match uses weak comparison: W/ prefixes are ignored on both sides
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in client_tags or opaque_tag in client_tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
 @router.get("/{project_id}/overview", response_model=OverviewMetrics)
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def get_overview(
@@ -55,7 +91,10 @@ async def get_overview(
 
     start_dt, end_dt = _parse_date_range(start, end, period)
     service = AnalyticsService(db)
-    return await service.get_overview(project_id, start_dt, end_dt)
+    overview = await service.get_overview(project_id, start_dt, end_dt)
+    # With only `period` the window ends at "now" and its bounds move on every
+    # poll, so only the metrics themselves go into the ETag
+    return _conditional_response(request, overview, etag_exclude={"period_start", "period_end"})
 
 
 @router.get("/{project_id}/timeseries", response_model=TimeseriesResponse)
@@ -77,7 +116,7 @@ async def get_timeseries(
     start_dt, end_dt = _parse_date_range(start, end, period)
     service = AnalyticsService(db)
     data = await service.get_timeseries(project_id, start_dt, end_dt, granularity)
-    return TimeseriesResponse(data=data, granularity=granularity)
+    return _conditional_response(request, TimeseriesResponse(data=data, granularity=granularity))
 
 
 @router.get("/{project_id}/top-events", response_model=TopEventsResponse)
@@ -99,7 +138,7 @@ async def get_top_events(
     start_dt, end_dt = _parse_date_range(start, end, period)
     service = AnalyticsService(db)
     data = await service.get_top_events(project_id, start_dt, end_dt, limit)
-    return TopEventsResponse(data=data)
+    return _conditional_response(request, TopEventsResponse(data=data))
 
 
 @router.get("/{project_id}/sessions", response_model=SessionsResponse)
@@ -122,7 +161,7 @@ async def get_sessions(
     start_dt, end_dt = _parse_date_range(start, end, period)
     service = AnalyticsService(db)
     data, total = await service.get_sessions(project_id, start_dt, end_dt, limit, offset)
-    return SessionsResponse(data=data, total=total)
+    return _conditional_response(request, SessionsResponse(data=data, total=total))
 
 
 @router.get("/{project_id}/users", response_model=UsersResponse)
@@ -145,4 +184,4 @@ async def get_users(
     start_dt, end_dt = _parse_date_range(start, end, period)
     service = AnalyticsService(db)
     data, total = await service.get_users(project_id, start_dt, end_dt, limit, offset)
-    return UsersResponse(data=data, total=total)
+    return _conditional_response(request, UsersResponse(data=data, total=total))
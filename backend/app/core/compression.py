@@ -0,0 +1,86 @@
+"""Inbound request decompression for gzip-encoded bodies (e.g. SDK event batches)."""
+
+import zlib
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bound on a decompressed body; guards against gzip bombs
+MAX_DECOMPRESSED_BODY_BYTES = 1024 * 1024  # 1 MiB
+
+
+class GZipRequestMiddleware:
+    """Transparently decompress request bodies sent with ``Content-Encoding: gzip``.
+
+    Responses are untouched; the app sees a plain body with the encoding
+    header removed and Content-Length updated. Only gzip bodies are held to
+    ``max_body_bytes``; plain bodies pass through unmeasured.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = MAX_DECOMPRESSED_BODY_BYTES):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = MutableHeaders(scope=scope)
+        if headers.get("content-encoding", "").lower() != "gzip":
+            await self.app(scope, receive, send)
+            return
+
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                more_body = message.get("more_body", False)
+                chunk = decompressor.decompress(
+                    message.get("body", b""), self.max_body_bytes - size + 1
+                )
+                size += len(chunk)
+                if size > self.max_body_bytes:
+                    break
+                chunks.append(chunk)
+            else:
+                chunk = decompressor.flush()
+                size += len(chunk)
+                chunks.append(chunk)
+        except zlib.error:
+            await self._reject(scope, receive, send, 400, "Invalid gzip request body")
+            return
+
+        if size > self.max_body_bytes:
+            await self._reject(scope, receive, send, 413, "Request body too large")
+            return
+        # A truncated stream, or data after the first gzip member (which the
+        # decompressor would otherwise drop without a word)
+        if not decompressor.eof or decompressor.unused_data:
+            await self._reject(scope, receive, send, 400, "Invalid gzip request body")
+            return
+
+        body = b"".join(chunks)
+        del headers["content-encoding"]
+        headers["content-length"] = str(len(body))
+        body_sent = False
+
+        async def receive_decompressed() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_decompressed, send)
+
+    @staticmethod
+    async def _reject(
+        scope: Scope, receive: Receive, send: Send, status_code: int, detail: str
+    ) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
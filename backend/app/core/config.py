@@ -32,6 +32,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing (Argon2id, OWASP baseline parameters)
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 19456  # KiB
+    ARGON2_PARALLELISM: int = 1
+
     # Cookie settings
     COOKIE_DOMAIN: str | None = None  # None = current domain
     COOKIE_SECURE: bool = True  # Set to False for local dev (HTTP)
@@ -66,7 +71,7 @@ class Settings(BaseSettings):
         return v
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()
 
@@ -5,6 +5,8 @@ from typing import Any
 
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
@@ -19,14 +21,46 @@ from app.core.redis import (
 logger = logging.getLogger(__name__)
 
 
+_password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    """Check for a legacy bcrypt hash ($2a$, $2b$ or $2y$)."""
+    return hashed_password.startswith("$2")
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    """Hash a password using Argon2id."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    """Verify a password against its hash.
+
+    Accepts Argon2id hashes and legacy bcrypt hashes created before the switch.
+    """
+    if _is_bcrypt_hash(hashed_password):
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash is legacy bcrypt or uses outdated Argon2 parameters."""
+    if _is_bcrypt_hash(hashed_password):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
+
+# Verified against when no user matches the email, so unknown accounts take as
+# long as a wrong password and can't be enumerated by response time.
+DUMMY_PASSWORD_HASH = hash_password("dummy-password-for-timing-equalization")
 
 
 def create_token(subject: int, token_type: str, expires_delta: timedelta) -> tuple[str, str]:
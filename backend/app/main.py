@@ -5,11 +5,13 @@ from typing import Any
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.api.v1.router import api_router
+from app.core.compression import GZipRequestMiddleware
 from app.core.config import settings, setup_logging
 from app.core.limiter import limiter
 from app.core.redis import close_redis, create_redis_client
@@ -38,12 +40,18 @@ app = FastAPI(
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
     lifespan=lifespan,
+    # orjson serializes the large analytics payloads several times faster
+    default_response_class=ORJSONResponse,
 )
 
 # Rate limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
 
+# Accept gzip-compressed request bodies (large event batches compress ~5x).
+# Added before CORS so CORS wraps it and its 400/413 responses stay readable.
+app.add_middleware(GZipRequestMiddleware)
+
 # CORS
 if settings.CORS_ORIGINS:
     app.add_middleware(
@@ -51,7 +59,7 @@ if settings.CORS_ORIGINS:
         allow_origins=settings.CORS_ORIGINS,
         allow_credentials=True,
         allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
-        allow_headers=["Authorization", "Content-Type", "Accept", "X-API-Key"],
+        allow_headers=["Authorization", "Content-Type", "Content-Encoding", "Accept", "X-API-Key"],
     )
 
 
@@ -27,7 +27,13 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def get_multi(self, skip: int = 0, limit: int = 100) -> tuple[list[ModelType], int]:
         """Get multiple records with pagination."""
-        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        # A stable order keeps offset pages from overlapping or skipping rows
+        result = await self.db.execute(
+            select(self.model)
+            .order_by(self.model.id)  # type: ignore[attr-defined]
+            .offset(skip)
+            .limit(limit)
+        )
         items = list(result.scalars().all())
 
         count_result = await self.db.execute(select(func.count()).select_from(self.model))
@@ -3,7 +3,13 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestError, ConflictError
-from app.core.security import hash_password, revoke_all_user_tokens, verify_password
+from app.core.security import (
+    DUMMY_PASSWORD_HASH,
+    hash_password,
+    password_needs_rehash,
+    revoke_all_user_tokens,
+    verify_password,
+)
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.base import BaseService
@@ -65,13 +71,15 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """Authenticate a user by email and password."""
         user = await self.get_by_email(email)
         if not user:
-            # Run bcrypt anyway to prevent timing attacks
-            verify_password(
-                password, "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.S9h0vqXp1V.1Wy"
-            )
+            # Verify against a dummy hash anyway to prevent timing attacks
+            verify_password(password, DUMMY_PASSWORD_HASH)
             return None
         if not verify_password(password, user.hashed_password):
             return None
+        if password_needs_rehash(user.hashed_password):
+            # Upgrade legacy bcrypt (or outdated Argon2) hashes on successful login
+            user.hashed_password = hash_password(password)
+            await self.db.flush()
         return user
 
     async def update_password(
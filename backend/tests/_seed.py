@@ -0,0 +1,22 @@
+"""Canonical fixture users, inserted once when the test schema is created.
+
+Tests see these rows through the test_user and superuser fixtures; whatever a
+test changes about them is rolled back with its transaction.
+"""
+
+# Password of every fixture user, and its Argon2id hash under the cost parameters
+# conftest sets for tests, precomputed so fixtures never run the hasher
+TEST_PASSWORD = "TestPassword123!"
+TEST_PASSWORD_HASH = (
+    "$argon2id$v=19$m=8,t=1,p=1$acnmL+WpRq5mPkr1SN+w2A$mDnEZXma87Lvrr9ByKdagsi9/KeF+5JQD1i3oWH+nHI"
+)
+
+TEST_USER_EMAIL = "testuser@example.com"
+SUPERUSER_EMAIL = "admin@example.com"
+
+SEED_SQL = f"""
+INSERT INTO users (email, hashed_password, full_name, is_active, is_superuser)
+VALUES
+    ('{TEST_USER_EMAIL}', '{TEST_PASSWORD_HASH}', 'Test User', TRUE, FALSE),
+    ('{SUPERUSER_EMAIL}', '{TEST_PASSWORD_HASH}', 'Admin User', TRUE, TRUE)
+"""
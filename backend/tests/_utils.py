@@ -0,0 +1,11 @@
+"""Assertion helpers shared across the API tests."""
+
+from typing import Any
+
+from httpx import Response
+
+
+def expect(response: Response, status_code: int) -> Any:
+    """Assert the response status and return its decoded JSON body, if any."""
+    assert response.status_code == status_code, response.text
+    return response.json() if response.content else None
@@ -1,17 +1,31 @@
+import asyncio
+import contextlib
 import os
-from typing import TYPE_CHECKING, AsyncGenerator
+import sys
+from collections.abc import AsyncGenerator, Mapping
+from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import patch
 
 import fakeredis
 import fakeredis.aioredis
 import pytest
+from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from pytest_asyncio import is_async_test
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from tests._seed import SEED_SQL, SUPERUSER_EMAIL, TEST_PASSWORD_HASH, TEST_USER_EMAIL
 
 # Set test env vars before importing app modules
 os.environ["SECRET_KEY"] = "test-secret-key-must-be-at-least-32-characters-long"
 os.environ["REDIS_URL"] = "memory://"
 os.environ["COOKIE_SECURE"] = "false"  # httpx test client uses http://, not https://
+# Cheapest valid Argon2id cost; tests need a correct round trip, not a slow one
+os.environ["ARGON2_TIME_COST"] = "1"
+os.environ["ARGON2_MEMORY_COST"] = "8"  # KiB; argon2 requires at least 8 x parallelism
 
 # Shared FakeServer holds state; each call creates a fresh client
 # bound to the current event loop (avoids pytest-asyncio loop mismatch).
@@ -41,15 +55,86 @@ async def _mock_stream_get_redis_unavailable():
 
 patch("app.core.stream.get_redis", _mock_stream_get_redis_unavailable).start()
 
-# Test database URL (use SQLite for tests)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# Each pytest-xdist worker gets its own database (SQLite DB or Postgres schema)
+# so workers running in parallel never see each other's rows.
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+TEST_SCHEMA = f"test_{WORKER_ID}"
+
+# Test database URL (in-memory SQLite by default; set TEST_DATABASE_URL to run
+# against a SQLite file or Postgres)
+TEST_DATABASE_URL = os.getenv(
+    "TEST_DATABASE_URL",
+    f"sqlite+aiosqlite:///file:test_{WORKER_ID}?mode=memory&cache=shared&uri=true",
+)
+
+_engine_kwargs: dict = {"echo": False, "pool_pre_ping": False}
+if TEST_DATABASE_URL.startswith("sqlite"):
+    # One connection for the whole session: an in-memory database only lives
+    # as long as a connection to it is open.
+    _engine_kwargs["poolclass"] = StaticPool
+else:
+    # A small pool kept for the whole session: the suite runs on one event loop,
+    # so connections (and for asyncpg, the startup handshake) are reused across tests.
+    _engine_kwargs.update(poolclass=AsyncAdaptedQueuePool, pool_size=5, max_overflow=0)
+if TEST_DATABASE_URL.startswith("postgresql+asyncpg"):
+    # Short test queries never benefit from JIT; skip its planning overhead
+    _engine_kwargs["connect_args"] = {
+        "server_settings": {"jit": "off", "search_path": TEST_SCHEMA},
+    }
+
+engine = create_async_engine(TEST_DATABASE_URL, **_engine_kwargs)
+
+
+# The sqlite driver manages BEGIN itself and never emits it before a SAVEPOINT,
+# which breaks nested transactions. Take over transaction control so the
+# per-test SAVEPOINT pattern in db_session works.
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# Test data is throwaway: skip journaling to disk and fsync on commit
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", _disable_driver_transactions)
+    event.listen(engine.sync_engine, "begin", _emit_begin)
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop the shared fixtures live on."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
 
-engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-TestingSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Dependency overrides installed by the session-scoped app fixture. Anything
+# else a test installs must be gone once its fixtures are torn down, or the
+# shared app and client would carry it into the next test.
+_SESSION_OVERRIDES: set = set()
 
-# Type checking imports only (for IDE support without importing at runtime)
-if TYPE_CHECKING:
-    pass
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    result = yield
+    app_module = sys.modules.get("app.main")
+    if app_module is not None:
+        leaked = set(app_module.app.dependency_overrides) - _SESSION_OVERRIDES
+        if leaked:
+            names = ", ".join(sorted(dep.__name__ for dep in leaked))
+            raise RuntimeError(f"{item.nodeid} left dependency overrides installed: {names}")
+    return result
 
 
 def _make_fake_redis():
@@ -57,11 +142,40 @@ def _make_fake_redis():
     return fakeredis.aioredis.FakeRedis(server=_fake_server, decode_responses=True)
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 async def setup_database():
-    from app.core.limiter import limiter
+    """Create and seed the schema once per session (per xdist worker), then remove it."""
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
     from app.db.base import Base
 
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA}")
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.exec_driver_sql(SEED_SQL)
+    yield
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE")
+        else:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+    # Don't leave one SQLite file per xdist worker behind
+    if (
+        engine.dialect.name == "sqlite"
+        and engine.url.database
+        and engine.url.query.get("mode") != "memory"
+    ):
+        Path(engine.url.database).unlink(missing_ok=True)
+
+
+@pytest.fixture(autouse=True)
+async def reset_state(settings, signed_access_tokens: dict[int, tuple[str, str]]):
+    from app.core.limiter import limiter
+    from app.core.security import store_access_token
+
     # Disable rate limiting in tests — limits are tested explicitly where needed
     limiter.enabled = False
 
@@ -69,11 +183,22 @@ async def setup_database():
     r = fakeredis.aioredis.FakeRedis(server=_fake_server, decode_responses=True)
     await r.flushall()
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    # Session-wide auth headers stay valid: put their token JTIs back
+    for user_id, (_, jti) in signed_access_tokens.items():
+        await store_access_token(
+            user_id=user_id,
+            jti=jti,
+            expires_in_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            redis=r,
+        )
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """The app's cached Settings instance (get_settings is lru_cached)."""
+    from app.core.config import get_settings
+
+    return get_settings()
 
 
 @pytest.fixture
@@ -82,101 +207,313 @@ async def fake_redis():
     return _make_fake_redis()
 
 
-@pytest.fixture
-async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    async with TestingSessionLocal() as session:
+@pytest.fixture(scope="session")
+async def connection(setup_database) -> AsyncGenerator[AsyncConnection, None]:
+    """Single connection shared by the whole session."""
+    async with engine.connect() as conn:
+        yield conn
+
+
+@pytest.fixture(scope="module")
+async def module_db_session(
+    connection: AsyncConnection,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only data shared by every test in a module.
+
+    Keeps an outer transaction open until the module finishes; each test's
+    db_session nests inside it as a SAVEPOINT, so per-test writes are rolled
+    back while this module's data survives between tests.
+    """
+    trans = await connection.begin()
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
         yield session
+    await trans.rollback()
 
 
 @pytest.fixture
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+async def db_session(connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
+    """Session wrapped in an outer transaction that is rolled back after the test.
+
+    Commits made by tests or the app only release a SAVEPOINT, so no data
+    leaks into the next test and the schema never needs to be rebuilt.
+    Inside a module_db_session transaction only the inner SAVEPOINT is undone.
+    """
+    if connection.in_transaction():
+        trans = await connection.begin_nested()
+    else:
+        trans = await connection.begin()
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        yield session
+    await trans.rollback()
+
+
+# The rolled-back session of the test currently using the client; the
+# session-wide get_db override hands it out, so only this changes per test.
+_client_db: dict[str, AsyncSession] = {}
+
+
+@pytest.fixture(scope="session")
+async def app() -> AsyncGenerator[FastAPI, None]:
+    """The FastAPI app, with every dependency override installed once."""
     from app.core.redis import get_redis_dep
     from app.db.session import get_db
     from app.main import app
 
-    async def override_get_db():
-        yield db_session
-
     async def override_get_redis_dep():
         return _make_fake_redis()
 
-    app.dependency_overrides[get_db] = override_get_db
+    # Requests share the test's session, so concurrent ones (asyncio.gather)
+    # take turns on it: an AsyncSession is not safe for concurrent use
+    db_lock = asyncio.Lock()
+
+    async def override_get_db():
+        async with db_lock:
+            yield _client_db["session"]
+
     app.dependency_overrides[get_redis_dep] = override_get_redis_dep
+    app.dependency_overrides[get_db] = override_get_db
+    _SESSION_OVERRIDES.update(app.dependency_overrides)
 
     # Also set app.state.redis for WebSocket handler (which reads it directly)
     app.state.redis = _make_fake_redis()
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    yield app
 
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-async def test_user(db_session: AsyncSession):
-    """Create a test user for authenticated tests."""
-    from app.schemas.user import UserCreate
-    from app.services.user_service import UserService
-
-    service = UserService(db_session)
-    user_data = UserCreate(
-        email="testuser@example.com",
-        password="TestPassword123!",  # Meets new password policy
-        full_name="Test User",
-    )
-    user = await service.create(user_data)
-    await db_session.commit()
-    return user
+def override_dependency(app: FastAPI):
+    """Context manager swapping one dependency on the shared app for a block.
+
+    Only that dependency's previous override (or its absence) is restored on
+    exit; the session and per-test overrides around it are left alone.
+    """
+
+    @contextlib.contextmanager
+    def _override(dependency, implementation):
+        missing = object()
+        previous = app.dependency_overrides.get(dependency, missing)
+        app.dependency_overrides[dependency] = implementation
+        try:
+            yield
+        finally:
+            if previous is missing:
+                app.dependency_overrides.pop(dependency, None)
+            else:
+                app.dependency_overrides[dependency] = previous
+
+    return _override
+
+
+@pytest.fixture(scope="session")
+async def http_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """One ASGI transport and client reused by every test."""
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    # In-process calls gain nothing from compression; ask for identity bodies.
+    # trust_env=False skips proxy/certificate/netrc lookups in the environment,
+    # and in-process calls never wait on a socket, so no timeouts are needed.
+    async with AsyncClient(
+        transport=transport,
+        base_url="http://test",
+        headers={"accept-encoding": "identity"},
+        trust_env=False,
+        timeout=None,
+    ) as ac:
+        # Warm up routing, middleware and validators here so the one-off cost
+        # isn't charged to whichever test happens to run first
+        await ac.get("/")
+        yield ac
 
 
 @pytest.fixture
-async def auth_headers(test_user) -> dict:
-    """Get auth headers for authenticated requests."""
-    from app.core.config import settings
-    from app.core.security import create_access_token, store_access_token
+async def client(
+    app: FastAPI, db_session: AsyncSession, http_client: AsyncClient
+) -> AsyncGenerator[AsyncClient, None]:
+    """The shared client, with get_db serving this test's rolled-back session."""
+    _client_db["session"] = db_session
 
-    token, jti = create_access_token(subject=test_user.id)
-    # store_access_token uses redis kwarg; when None it falls back to
-    # the patched get_redis() which returns fakeredis.
-    await store_access_token(
-        user_id=test_user.id,
-        jti=jti,
-        expires_in_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
-    return {"Authorization": f"Bearer {token}"}
+    # The client is shared, so drop auth cookies left behind by the previous test
+    http_client.cookies.clear()
+    yield http_client
+
+    _client_db.clear()
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password() -> str:
+    """Hash of TEST_PASSWORD for every user inserted directly into the DB."""
+    return TEST_PASSWORD_HASH
+
+
+@pytest.fixture(scope="session")
+def insert_user(hashed_test_password: str):
+    """Factory inserting a user with password TEST_PASSWORD through a given session.
+
+    Module-scoped fixtures pass module_db_session to create accounts once per
+    module; per-test code should use make_user.
+    """
+    from app.models.user import User
+
+    async def _insert_user(
+        session: AsyncSession, email: str, full_name: str | None = None, is_active: bool = True
+    ) -> User:
+        user = User(
+            email=email,
+            hashed_password=hashed_test_password,
+            full_name=full_name,
+            is_active=is_active,
+        )
+        session.add(user)
+        await session.flush()
+        return user
+
+    return _insert_user
+
+
+@pytest.fixture(scope="session")
+def make_project(insert_user):
+    """Factory creating a project and a fresh owner account, then committing.
+
+    Returns the project's id, name, plaintext API key and owner_id, for
+    module-scoped fixtures that share one project across a module's tests.
+    """
+    from app.schemas.project import ProjectCreate
+    from app.services.project_service import ProjectService
+
+    async def _make_project(session: AsyncSession, owner_email: str, name: str) -> dict:
+        owner = await insert_user(session, owner_email)
+        project, api_key = await ProjectService(session).create(owner.id, ProjectCreate(name=name))
+        await session.commit()
+        return {"id": project.id, "name": project.name, "api_key": api_key, "owner_id": owner.id}
+
+    return _make_project
 
 
 @pytest.fixture
-async def superuser(db_session: AsyncSession):
-    """Create a superuser for admin tests."""
-    from app.core.security import hash_password
+async def make_user(db_session: AsyncSession, insert_user):
+    """Factory inserting a user with password TEST_PASSWORD straight into the DB.
+
+    Use this when a test only needs an existing account, not the register endpoint.
+    """
     from app.models.user import User
 
-    user = User(
-        email="admin@example.com",
-        hashed_password=hash_password("AdminPassword123!"),  # Meets new password policy
-        full_name="Admin User",
-        is_superuser=True,
-    )
-    db_session.add(user)
-    await db_session.flush()
-    await db_session.refresh(user)
-    await db_session.commit()
-    return user
+    async def _make_user(email: str, is_active: bool = True) -> User:
+        return await insert_user(db_session, email, is_active=is_active)
+
+    return _make_user
 
 
 @pytest.fixture
-async def superuser_headers(superuser) -> dict:
-    """Get auth headers for superuser requests."""
-    from app.core.config import settings
-    from app.core.security import create_access_token, store_access_token
+async def logged_in_client(client: AsyncClient, make_user, settings):
+    """Factory returning (client, user, access_token, refresh_token) for a fresh user.
 
-    token, jti = create_access_token(subject=superuser.id)
-    # Falls back to patched get_redis() for fakeredis
-    await store_access_token(
-        user_id=superuser.id,
-        jti=jti,
-        expires_in_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    Tokens are signed and stored directly and set as auth cookies on the client,
+    so tests start authenticated without a register + login round trip.
+    """
+    from app.core.security import (
+        create_access_token,
+        create_refresh_token,
+        store_access_token,
+        store_refresh_token,
     )
-    return {"Authorization": f"Bearer {token}"}
+
+    async def _logged_in_client(email: str = "user@example.com"):
+        user = await make_user(email)
+        access_token, access_jti = create_access_token(subject=user.id)
+        refresh_token, refresh_jti = create_refresh_token(subject=user.id)
+        # Both helpers fall back to the patched get_redis() for fakeredis
+        await store_access_token(
+            user_id=user.id,
+            jti=access_jti,
+            expires_in_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+        await store_refresh_token(
+            user_id=user.id,
+            jti=refresh_jti,
+            expires_in_seconds=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        )
+        client.cookies.set("access_token", access_token)
+        client.cookies.set("refresh_token", refresh_token)
+        return client, user, access_token, refresh_token
+
+    return _logged_in_client
+
+
+async def _load_seeded_user(connection: AsyncConnection, email: str):
+    """Load a seeded user as a detached object whose attributes stay readable."""
+    from app.models.user import User
+
+    async with AsyncSession(bind=connection, expire_on_commit=False) as session:
+        return await session.scalar(select(User).where(User.email == email))
+
+
+@pytest.fixture(scope="session")
+async def test_user(connection: AsyncConnection):
+    """The seeded regular user (password TEST_PASSWORD) for authenticated tests."""
+    return await _load_seeded_user(connection, TEST_USER_EMAIL)
+
+
+@pytest.fixture(scope="session")
+def signed_access_tokens() -> dict[int, tuple[str, str]]:
+    """Access tokens signed once per session, keyed by user ID.
+
+    reset_state re-stores every JTI here after flushing Redis, so the tokens
+    stay valid from one test to the next.
+    """
+    return {}
+
+
+@pytest.fixture(scope="session")
+def make_auth_headers(settings, signed_access_tokens: dict[int, tuple[str, str]]):
+    """Factory returning Bearer headers for a user ID, with the token JTI stored.
+
+    Each user's headers are built once and handed out as a read-only mapping,
+    so a test cannot leak edits into the next one; merge with ``{**headers}``.
+    """
+    from app.core.security import create_access_token, store_access_token
+
+    headers: dict[int, Mapping[str, str]] = {}
+
+    async def _make_auth_headers(user_id: int) -> Mapping[str, str]:
+        if user_id not in signed_access_tokens:
+            _, jti = signed_access_tokens[user_id] = create_access_token(subject=user_id)
+            # store_access_token uses redis kwarg; when None it falls back to
+            # the patched get_redis() which returns fakeredis.
+            await store_access_token(
+                user_id=user_id,
+                jti=jti,
+                expires_in_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            )
+        if user_id not in headers:
+            token, _ = signed_access_tokens[user_id]
+            headers[user_id] = MappingProxyType({"Authorization": f"Bearer {token}"})
+        return headers[user_id]
+
+    return _make_auth_headers
+
+
+@pytest.fixture(scope="session")
+async def auth_headers(test_user, make_auth_headers) -> Mapping[str, str]:
+    """Get auth headers for authenticated requests."""
+    return await make_auth_headers(test_user.id)
+
+
+@pytest.fixture(scope="session")
+async def superuser(connection: AsyncConnection):
+    """The seeded superuser for admin tests."""
+    return await _load_seeded_user(connection, SUPERUSER_EMAIL)
+
+
+@pytest.fixture(scope="session")
+async def superuser_headers(superuser, make_auth_headers) -> Mapping[str, str]:
+    """Get auth headers for superuser requests."""
+    return await make_auth_headers(superuser.id)
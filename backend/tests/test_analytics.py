@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -5,12 +6,11 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.event import Event, EventRollupHourly
-from app.models.user import User
 
 
 @pytest.fixture
 async def project_with_events(
-    client: AsyncClient, auth_headers: dict, test_user: User, db_session: AsyncSession
+    client: AsyncClient, auth_headers: Mapping[str, str], db_session: AsyncSession
 ) -> dict:
     """Create a project with sample events for analytics testing."""
     # Create project
@@ -77,8 +77,9 @@ async def project_with_events(
     return project_data
 
 
-@pytest.mark.asyncio
-async def test_overview(client: AsyncClient, auth_headers: dict, project_with_events: dict):
+async def test_overview(
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_events: dict
+):
     """Test overview metrics endpoint."""
     project_id = project_with_events["id"]
     response = await client.get(
@@ -93,7 +94,45 @@ async def test_overview(client: AsyncClient, auth_headers: dict, project_with_ev
     assert data["top_event"] == "page_view"
 
 
-@pytest.mark.asyncio
+async def test_overview_etag(
+    client: AsyncClient,
+    auth_headers: Mapping[str, str],
+    project_with_events: dict,
+    db_session: AsyncSession,
+):
+    """Test repeat reads with a matching ETag get 304 until the data changes."""
+    project_id = project_with_events["id"]
+    now = datetime.now(timezone.utc)
+    # A fixed window, so period_start/period_end don't change between reads
+    params = {
+        "start": (now - timedelta(hours=2)).isoformat(),
+        "end": (now + timedelta(hours=1)).isoformat(),
+    }
+    url = f"/api/v1/analytics/{project_id}/overview"
+
+    response = await client.get(url, params=params, headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    # The period bounds are left out of the hash, so the tag is only weak
+    assert etag.startswith('W/"')
+
+    cached = await client.get(url, params=params, headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    wildcard = await client.get(url, params=params, headers={**auth_headers, "If-None-Match": "*"})
+    assert wildcard.status_code == 304
+
+    db_session.add(Event(project_id=project_id, event_name="signup", session_id="sess_3"))
+    await db_session.commit()
+
+    changed = await client.get(url, params=params, headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["total_events"] == 6
+
+
 async def test_overview_unauthenticated(client: AsyncClient, project_with_events: dict):
     """Test overview requires authentication."""
     project_id = project_with_events["id"]
@@ -101,8 +140,9 @@ async def test_overview_unauthenticated(client: AsyncClient, project_with_events
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_timeseries(client: AsyncClient, auth_headers: dict, project_with_events: dict):
+async def test_timeseries(
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_events: dict
+):
     """Test timeseries endpoint."""
     project_id = project_with_events["id"]
     response = await client.get(
@@ -118,8 +158,9 @@ async def test_timeseries(client: AsyncClient, auth_headers: dict, project_with_
     assert "count" in point
 
 
-@pytest.mark.asyncio
-async def test_top_events(client: AsyncClient, auth_headers: dict, project_with_events: dict):
+async def test_top_events(
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_events: dict
+):
     """Test top events endpoint."""
     project_id = project_with_events["id"]
     response = await client.get(
@@ -133,8 +174,9 @@ async def test_top_events(client: AsyncClient, auth_headers: dict, project_with_
     assert data[0]["count"] == 3
 
 
-@pytest.mark.asyncio
-async def test_sessions(client: AsyncClient, auth_headers: dict, project_with_events: dict):
+async def test_sessions(
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_events: dict
+):
     """Test sessions endpoint."""
     project_id = project_with_events["id"]
     response = await client.get(
@@ -147,8 +189,9 @@ async def test_sessions(client: AsyncClient, auth_headers: dict, project_with_ev
     assert len(data["data"]) == 2
 
 
-@pytest.mark.asyncio
-async def test_users_analytics(client: AsyncClient, auth_headers: dict, project_with_events: dict):
+async def test_users_analytics(
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_events: dict
+):
     """Test users analytics endpoint."""
     project_id = project_with_events["id"]
     response = await client.get(
@@ -161,9 +204,8 @@ async def test_users_analytics(client: AsyncClient, auth_headers: dict, project_
     assert len(data["data"]) == 2
 
 
-@pytest.mark.asyncio
 async def test_analytics_wrong_project(
-    client: AsyncClient, auth_headers: dict, superuser: User, superuser_headers: dict
+    client: AsyncClient, auth_headers: Mapping[str, str], superuser_headers: Mapping[str, str]
 ):
     """Test accessing analytics for another user's project."""
     resp = await client.post(
@@ -180,8 +222,7 @@ async def test_analytics_wrong_project(
     assert response.status_code == 403
 
 
-@pytest.mark.asyncio
-async def test_overview_empty_project(client: AsyncClient, auth_headers: dict):
+async def test_overview_empty_project(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test overview with no events."""
     resp = await client.post(
         "/api/v1/projects/",
@@ -210,8 +251,7 @@ async def test_overview_empty_project(client: AsyncClient, auth_headers: dict):
 @pytest.fixture
 async def project_with_rollups(
     client: AsyncClient,
-    auth_headers: dict,
-    test_user: User,
+    auth_headers: Mapping[str, str],
     db_session: AsyncSession,
 ) -> dict:
     """Project with rollup rows for past hours AND raw events for the current hour."""
@@ -291,9 +331,8 @@ async def project_with_rollups(
     return project_data
 
 
-@pytest.mark.asyncio
 async def test_overview_rollup_plus_raw(
-    client: AsyncClient, auth_headers: dict, project_with_rollups: dict
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_rollups: dict
 ):
     """Overview combines rollup totals with current-hour raw events."""
     project_id = project_with_rollups["id"]
@@ -313,9 +352,8 @@ async def test_overview_rollup_plus_raw(
     assert data["top_event"] == "page_view"
 
 
-@pytest.mark.asyncio
 async def test_timeseries_rollup_plus_raw(
-    client: AsyncClient, auth_headers: dict, project_with_rollups: dict
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_rollups: dict
 ):
     """Timeseries includes rollup hours and current-hour raw data."""
     project_id = project_with_rollups["id"]
@@ -333,9 +371,8 @@ async def test_timeseries_rollup_plus_raw(
     assert total == 213
 
 
-@pytest.mark.asyncio
 async def test_top_events_rollup_plus_raw(
-    client: AsyncClient, auth_headers: dict, project_with_rollups: dict
+    client: AsyncClient, auth_headers: Mapping[str, str], project_with_rollups: dict
 ):
     """Top events merges rollup and raw counts correctly."""
     project_id = project_with_rollups["id"]
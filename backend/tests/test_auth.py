@@ -1,23 +1,26 @@
+from collections.abc import Mapping
+
+import bcrypt
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
 from app.models.user import User
+from tests._seed import TEST_PASSWORD
 
 # ---------------------------------------------------------------------------
 # Registration
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_register_user(client: AsyncClient):
     """Test user registration."""
     response = await client.post(
         "/api/v1/auth/register",
         json={
             "email": "newuser@example.com",
-            "password": "TestPassword123!",
+            "password": TEST_PASSWORD,
             "full_name": "New User",
         },
     )
@@ -27,42 +30,10 @@ async def test_register_user(client: AsyncClient):
     assert "id" in data
 
 
-@pytest.mark.asyncio
-async def test_register_weak_password(client: AsyncClient):
-    """Test registration fails with weak password."""
-    response = await client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "weak@example.com",
-            "password": "short",  # Too short, no uppercase, no digit
-        },
-    )
-    assert response.status_code == 422  # Validation error
-
-
-@pytest.mark.asyncio
-async def test_register_password_without_special_char(client: AsyncClient):
-    """Test registration fails without special character in password."""
-    response = await client.post(
-        "/api/v1/auth/register",
-        json={
-            "email": "nospecial@example.com",
-            "password": "TestPassword1234",  # Meets length, upper, lower, digit, but no special char
-        },
-    )
-    assert response.status_code == 422
-    # Verify the error message mentions special character
-    assert "special character" in response.json()["detail"][0]["msg"].lower()
-
-
-@pytest.mark.asyncio
-async def test_register_duplicate_email(client: AsyncClient):
+async def test_register_duplicate_email(client: AsyncClient, make_user):
     """Test registration fails with duplicate email."""
-    # First registration
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "dupe@example.com", "password": "TestPassword123!"},
-    )
+    # Existing account
+    await make_user("dupe@example.com")
 
     # Duplicate registration
     response = await client.post(
@@ -77,19 +48,15 @@ async def test_register_duplicate_email(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_login(client: AsyncClient):
+async def test_login(client: AsyncClient, make_user):
     """Test successful login returns tokens and sets auth cookies."""
-    # Register first
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "login@example.com", "password": "TestPassword123!"},
-    )
+    # Existing account
+    await make_user("login@example.com")
 
     # Login
     response = await client.post(
         "/api/v1/auth/login",
-        json={"email": "login@example.com", "password": "TestPassword123!"},
+        json={"email": "login@example.com", "password": TEST_PASSWORD},
     )
     assert response.status_code == 200
     data = response.json()
@@ -103,7 +70,25 @@ async def test_login(client: AsyncClient):
     assert "logged_in" in response.cookies
 
 
-@pytest.mark.asyncio
+async def test_login_upgrades_legacy_bcrypt_hash(client: AsyncClient, db_session: AsyncSession):
+    """Test login accepts a legacy bcrypt hash and rehashes it with Argon2id."""
+    user = User(
+        email="legacy@example.com",
+        hashed_password=bcrypt.hashpw(TEST_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode(),
+        full_name="Legacy User",
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": "legacy@example.com", "password": TEST_PASSWORD},
+    )
+    assert response.status_code == 200
+    await db_session.refresh(user)
+    assert user.hashed_password.startswith("$argon2id$")
+
+
 async def test_login_invalid_credentials(client: AsyncClient):
     """Test login fails with invalid credentials."""
     response = await client.post(
@@ -113,21 +98,23 @@ async def test_login_invalid_credentials(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_login_inactive_user(client: AsyncClient, db_session: AsyncSession):
+async def test_login_inactive_user(
+    client: AsyncClient, db_session: AsyncSession, hashed_test_password: str
+):
     """Test that inactive users cannot login via /auth/login."""
-    user = User(
-        email="inactive@example.com",
-        hashed_password=hash_password("TestPassword123!"),
-        full_name="Inactive User",
-        is_active=False,
+    await db_session.execute(
+        insert(User).values(
+            email="inactive@example.com",
+            hashed_password=hashed_test_password,
+            full_name="Inactive User",
+            is_active=False,
+        )
     )
-    db_session.add(user)
     await db_session.commit()
 
     response = await client.post(
         "/api/v1/auth/login",
-        json={"email": "inactive@example.com", "password": "TestPassword123!"},
+        json={"email": "inactive@example.com", "password": TEST_PASSWORD},
     )
     assert response.status_code == 401
 
@@ -137,17 +124,13 @@ async def test_login_inactive_user(client: AsyncClient, db_session: AsyncSession
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_login_form_success(client: AsyncClient):
+async def test_login_form_success(client: AsyncClient, make_user):
     """Test successful login via OAuth2 form endpoint."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "formlogin@example.com", "password": "TestPassword123!"},
-    )
+    await make_user("formlogin@example.com")
 
     response = await client.post(
         "/api/v1/auth/login/form",
-        data={"username": "formlogin@example.com", "password": "TestPassword123!"},
+        data={"username": "formlogin@example.com", "password": TEST_PASSWORD},
     )
     assert response.status_code == 200
     data = response.json()
@@ -155,7 +138,6 @@ async def test_login_form_success(client: AsyncClient):
     assert "refresh_token" in data
 
 
-@pytest.mark.asyncio
 async def test_login_form_invalid_credentials(client: AsyncClient):
     """Test form login fails with invalid credentials."""
     response = await client.post(
@@ -165,21 +147,23 @@ async def test_login_form_invalid_credentials(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_login_form_inactive_user(client: AsyncClient, db_session: AsyncSession):
+async def test_login_form_inactive_user(
+    client: AsyncClient, db_session: AsyncSession, hashed_test_password: str
+):
     """Test that inactive users cannot login via /auth/login/form."""
-    user = User(
-        email="inactive_form@example.com",
-        hashed_password=hash_password("TestPassword123!"),
-        full_name="Inactive User Form",
-        is_active=False,
+    await db_session.execute(
+        insert(User).values(
+            email="inactive_form@example.com",
+            hashed_password=hashed_test_password,
+            full_name="Inactive User Form",
+            is_active=False,
+        )
     )
-    db_session.add(user)
     await db_session.commit()
 
     response = await client.post(
         "/api/v1/auth/login/form",
-        data={"username": "inactive_form@example.com", "password": "TestPassword123!"},
+        data={"username": "inactive_form@example.com", "password": TEST_PASSWORD},
     )
     assert response.status_code == 401
 
@@ -189,37 +173,26 @@ async def test_login_form_inactive_user(client: AsyncClient, db_session: AsyncSe
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_password_missing_uppercase(client: AsyncClient):
-    """Test registration fails without uppercase letter."""
+# Each rule is unit-tested in test_core.TestPasswordValidation; this only checks
+# that validator errors surface through the register endpoint as 422s.
+@pytest.mark.parametrize(
+    ("password", "message"),
+    [
+        ("Short1!", "at least 12 characters"),
+        ("testpassword123!", "uppercase"),
+        ("TESTPASSWORD123!", "lowercase"),
+        ("TestPasswordABC!", "digit"),
+        ("TestPassword1234", "special character"),
+    ],
+)
+async def test_register_rejects_weak_password(client: AsyncClient, password: str, message: str):
+    """Test registration fails when the password breaks a strength rule."""
     response = await client.post(
         "/api/v1/auth/register",
-        json={"email": "noup@example.com", "password": "testpassword123!"},
+        json={"email": "weak@example.com", "password": password},
     )
     assert response.status_code == 422
-    assert "uppercase" in response.json()["detail"][0]["msg"].lower()
-
-
-@pytest.mark.asyncio
-async def test_password_missing_lowercase(client: AsyncClient):
-    """Test registration fails without lowercase letter."""
-    response = await client.post(
-        "/api/v1/auth/register",
-        json={"email": "nolow@example.com", "password": "TESTPASSWORD123!"},
-    )
-    assert response.status_code == 422
-    assert "lowercase" in response.json()["detail"][0]["msg"].lower()
-
-
-@pytest.mark.asyncio
-async def test_password_missing_digit(client: AsyncClient):
-    """Test registration fails without digit."""
-    response = await client.post(
-        "/api/v1/auth/register",
-        json={"email": "nodigit@example.com", "password": "TestPasswordABC!"},
-    )
-    assert response.status_code == 422
-    assert "digit" in response.json()["detail"][0]["msg"].lower()
+    assert message in response.json()["detail"][0]["msg"].lower()
 
 
 # ---------------------------------------------------------------------------
@@ -227,18 +200,10 @@ async def test_password_missing_digit(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_refresh_token_via_cookie(client: AsyncClient):
+async def test_refresh_token_via_cookie(client: AsyncClient, logged_in_client):
     """Test token refresh via cookie (no body needed)."""
-    # Register and login — sets auth cookies on the client
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "refresh@example.com", "password": "TestPassword123!"},
-    )
-    await client.post(
-        "/api/v1/auth/login",
-        json={"email": "refresh@example.com", "password": "TestPassword123!"},
-    )
+    # Auth cookies are set on the client
+    await logged_in_client("refresh@example.com")
 
     # Refresh — endpoint reads refresh_token from cookie
     response = await client.post("/api/v1/auth/refresh")
@@ -249,18 +214,9 @@ async def test_refresh_token_via_cookie(client: AsyncClient):
     assert "access_token" in response.cookies
 
 
-@pytest.mark.asyncio
-async def test_refresh_token_via_body(client: AsyncClient):
+async def test_refresh_token_via_body(client: AsyncClient, logged_in_client):
     """Test token refresh via body (backward compat)."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "refreshbody@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "refreshbody@example.com", "password": "TestPassword123!"},
-    )
-    refresh_token = login_response.json()["refresh_token"]
+    _, _, _, refresh_token = await logged_in_client("refreshbody@example.com")
 
     # Clear cookies so endpoint falls back to body
     client.cookies.clear()
@@ -273,7 +229,6 @@ async def test_refresh_token_via_body(client: AsyncClient):
     assert "access_token" in response.json()
 
 
-@pytest.mark.asyncio
 async def test_refresh_with_invalid_token(client: AsyncClient):
     """Test refresh fails with invalid token."""
     response = await client.post(
@@ -283,19 +238,9 @@ async def test_refresh_with_invalid_token(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_refresh_with_access_token(client: AsyncClient):
+async def test_refresh_with_access_token(client: AsyncClient, logged_in_client):
     """Test refresh fails when using access token instead of refresh token."""
-    # Register and login
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "accessrefresh@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "accessrefresh@example.com", "password": "TestPassword123!"},
-    )
-    access_token = login_response.json()["access_token"]
+    _, _, access_token, _ = await logged_in_client("accessrefresh@example.com")
 
     # Clear cookies so endpoint uses body fallback
     client.cookies.clear()
@@ -313,18 +258,9 @@ async def test_refresh_with_access_token(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_logout_via_cookie(client: AsyncClient):
+async def test_logout_via_cookie(client: AsyncClient, logged_in_client):
     """Test logout using cookie-based auth and refresh token."""
-    # Register and login
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "logoutcookie@example.com", "password": "TestPassword123!"},
-    )
-    await client.post(
-        "/api/v1/auth/login",
-        json={"email": "logoutcookie@example.com", "password": "TestPassword123!"},
-    )
+    await logged_in_client("logoutcookie@example.com")
 
     # Logout — auth from access_token cookie, refresh from refresh_token cookie
     response = await client.post("/api/v1/auth/logout")
@@ -332,20 +268,9 @@ async def test_logout_via_cookie(client: AsyncClient):
     assert response.json()["message"] == "Successfully logged out"
 
 
-@pytest.mark.asyncio
-async def test_logout_via_body(client: AsyncClient):
+async def test_logout_via_body(client: AsyncClient, logged_in_client):
     """Test logout with tokens passed via header + body (backward compat)."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "logout@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "logout@example.com", "password": "TestPassword123!"},
-    )
-    tokens = login_response.json()
-    access_token = tokens["access_token"]
-    refresh_token = tokens["refresh_token"]
+    _, _, access_token, refresh_token = await logged_in_client("logout@example.com")
 
     # Clear cookies, use header + body
     client.cookies.clear()
@@ -358,15 +283,13 @@ async def test_logout_via_body(client: AsyncClient):
     assert response.status_code == 200
 
 
-@pytest.mark.asyncio
 async def test_logout_without_auth(client: AsyncClient):
     """Test logout fails without auth cookie or Bearer token."""
     response = await client.post("/api/v1/auth/logout")
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_logout_with_invalid_token(client: AsyncClient, auth_headers: dict):
+async def test_logout_with_invalid_token(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test logout fails with invalid refresh token."""
     response = await client.post(
         "/api/v1/auth/logout",
@@ -376,18 +299,9 @@ async def test_logout_with_invalid_token(client: AsyncClient, auth_headers: dict
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_logout_with_access_token(client: AsyncClient):
+async def test_logout_with_access_token(client: AsyncClient, logged_in_client):
     """Test logout fails when using access token instead of refresh token."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "accesslogout@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "accesslogout@example.com", "password": "TestPassword123!"},
-    )
-    access_token = login_response.json()["access_token"]
+    _, _, access_token, _ = await logged_in_client("accesslogout@example.com")
 
     # Clear cookies, use header + body
     client.cookies.clear()
@@ -405,8 +319,7 @@ async def test_logout_with_access_token(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_get_me(client: AsyncClient, auth_headers: dict):
+async def test_get_me(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test get current user via Bearer header."""
     response = await client.get("/api/v1/auth/me", headers=auth_headers)
     assert response.status_code == 200
@@ -415,17 +328,9 @@ async def test_get_me(client: AsyncClient, auth_headers: dict):
     assert "id" in data
 
 
-@pytest.mark.asyncio
-async def test_get_me_via_cookie(client: AsyncClient):
+async def test_get_me_via_cookie(client: AsyncClient, logged_in_client):
     """Test get current user via access_token cookie."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "cookieme@example.com", "password": "TestPassword123!"},
-    )
-    await client.post(
-        "/api/v1/auth/login",
-        json={"email": "cookieme@example.com", "password": "TestPassword123!"},
-    )
+    await logged_in_client("cookieme@example.com")
 
     # /me should work via cookie (no Authorization header needed)
     response = await client.get("/api/v1/auth/me")
@@ -433,14 +338,12 @@ async def test_get_me_via_cookie(client: AsyncClient):
     assert response.json()["email"] == "cookieme@example.com"
 
 
-@pytest.mark.asyncio
 async def test_get_me_unauthorized(client: AsyncClient):
     """Test get current user without auth fails."""
     response = await client.get("/api/v1/auth/me")
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_access_with_invalid_token(client: AsyncClient):
     """Test protected endpoint fails with malformed token."""
     response = await client.get(
@@ -450,18 +353,9 @@ async def test_access_with_invalid_token(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_access_with_refresh_token(client: AsyncClient):
+async def test_access_with_refresh_token(client: AsyncClient, logged_in_client):
     """Test protected endpoint fails when using refresh token as Bearer."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "refreshaccess@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "refreshaccess@example.com", "password": "TestPassword123!"},
-    )
-    refresh_token = login_response.json()["refresh_token"]
+    _, _, _, refresh_token = await logged_in_client("refreshaccess@example.com")
 
     # Clear cookies so endpoint relies on header only
     client.cookies.clear()
@@ -479,18 +373,9 @@ async def test_access_with_refresh_token(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_access_token_revoked_after_logout(client: AsyncClient):
+async def test_access_token_revoked_after_logout(client: AsyncClient, logged_in_client):
     """Test that access token is invalidated after logout."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "revoke@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "revoke@example.com", "password": "TestPassword123!"},
-    )
-    access_token = login_response.json()["access_token"]
+    _, _, access_token, _ = await logged_in_client("revoke@example.com")
 
     # Verify access works before logout (via cookie)
     response = await client.get("/api/v1/auth/me")
@@ -507,18 +392,9 @@ async def test_access_token_revoked_after_logout(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_access_token_revoked_after_refresh(client: AsyncClient):
+async def test_access_token_revoked_after_refresh(client: AsyncClient, logged_in_client):
     """Test that old access token is revoked after token refresh."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "refreshrevoke@example.com", "password": "TestPassword123!"},
-    )
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": "refreshrevoke@example.com", "password": "TestPassword123!"},
-    )
-    old_access_token = login_response.json()["access_token"]
+    _, _, old_access_token, _ = await logged_in_client("refreshrevoke@example.com")
 
     # Verify access works before refresh
     response = await client.get("/api/v1/auth/me")
@@ -550,15 +426,13 @@ async def test_access_token_revoked_after_refresh(client: AsyncClient):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_ws_ticket_requires_auth(client: AsyncClient):
     """Test ws-ticket endpoint requires authentication."""
     response = await client.post("/api/v1/auth/ws-ticket")
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_ws_ticket_success(client: AsyncClient, auth_headers: dict):
+async def test_ws_ticket_success(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test ws-ticket returns a ticket string."""
     response = await client.post("/api/v1/auth/ws-ticket", headers=auth_headers)
     assert response.status_code == 200
@@ -568,17 +442,9 @@ async def test_ws_ticket_success(client: AsyncClient, auth_headers: dict):
     assert len(data["ticket"]) > 0
 
 
-@pytest.mark.asyncio
-async def test_ws_ticket_via_cookie(client: AsyncClient):
+async def test_ws_ticket_via_cookie(client: AsyncClient, logged_in_client):
     """Test ws-ticket works with cookie auth."""
-    await client.post(
-        "/api/v1/auth/register",
-        json={"email": "wsticket@example.com", "password": "TestPassword123!"},
-    )
-    await client.post(
-        "/api/v1/auth/login",
-        json={"email": "wsticket@example.com", "password": "TestPassword123!"},
-    )
+    await logged_in_client("wsticket@example.com")
 
     # Should work via cookie auth
     response = await client.post("/api/v1/auth/ws-ticket")
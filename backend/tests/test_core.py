@@ -1,5 +1,6 @@
 """Unit tests for core modules."""
 
+import bcrypt
 import pytest
 
 from app.core.security import (
@@ -7,6 +8,7 @@ from app.core.security import (
     create_refresh_token,
     decode_token,
     hash_password,
+    password_needs_rehash,
     verify_password,
 )
 from app.core.validators import validate_password_strength
@@ -16,12 +18,10 @@ class TestPasswordHashing:
     """Tests for password hashing functions."""
 
     def test_hash_password(self):
-        """Test password hashing produces valid bcrypt hash."""
+        """Test password hashing produces a valid Argon2id hash."""
         password = "TestPassword123!"
         hashed = hash_password(password)
-        # bcrypt hashes can start with $2a$, $2b$, or $2y$
-        assert hashed.startswith("$2")
-        assert len(hashed) == 60
+        assert hashed.startswith("$argon2id$")
 
     def test_verify_password_correct(self):
         """Test password verification with correct password."""
@@ -35,55 +35,88 @@ class TestPasswordHashing:
         hashed = hash_password(password)
         assert verify_password("WrongPassword456!", hashed) is False
 
+    def test_hash_password_uses_configured_cost(self):
+        """Test hashing honours the Argon2 settings (lowered in conftest)."""
+        assert "$m=8,t=1,p=1$" in hash_password("TestPassword123!")
+
+    def test_verify_legacy_bcrypt_hash(self):
+        """Test bcrypt hashes created before the Argon2id switch still verify."""
+        legacy = bcrypt.hashpw(b"TestPassword123!", bcrypt.gensalt(rounds=4)).decode()
+        assert verify_password("TestPassword123!", legacy) is True
+        assert verify_password("WrongPassword456!", legacy) is False
+
+    def test_verify_malformed_hash(self):
+        """Test verification against a malformed hash fails instead of raising."""
+        assert verify_password("TestPassword123!", "not-a-hash") is False
+
+    def test_password_needs_rehash(self):
+        """Test legacy bcrypt hashes are flagged for rehash, current ones are not."""
+        legacy = bcrypt.hashpw(b"TestPassword123!", bcrypt.gensalt(rounds=4)).decode()
+        assert password_needs_rehash(legacy) is True
+        assert password_needs_rehash(hash_password("TestPassword123!")) is False
+
+
+@pytest.fixture(scope="module")
+def signed_access() -> tuple[str, str]:
+    """Access token (and jti) for user 123, signed once for the module."""
+    return create_access_token(subject=123)
+
+
+@pytest.fixture(scope="module")
+def signed_refresh() -> tuple[str, str]:
+    """Refresh token (and jti) for user 123, signed once for the module."""
+    return create_refresh_token(subject=123)
+
 
 class TestTokens:
     """Tests for JWT token functions."""
 
-    def test_create_access_token(self):
+    def test_create_access_token(self, signed_access):
         """Test access token creation."""
-        token, jti = create_access_token(subject=1)
+        token, jti = signed_access
         assert isinstance(token, str)
         assert isinstance(jti, str)
         assert len(token) > 0
         assert len(jti) == 36  # UUID format
 
-    def test_create_refresh_token(self):
+    def test_create_refresh_token(self, signed_refresh):
         """Test refresh token creation."""
-        token, jti = create_refresh_token(subject=1)
+        token, jti = signed_refresh
         assert isinstance(token, str)
         assert isinstance(jti, str)
         assert len(token) > 0
 
-    def test_decode_valid_token(self):
+    def test_decode_valid_token(self, signed_access):
         """Test decoding a valid token."""
-        token, _ = create_access_token(subject=123)
+        token, jti = signed_access
         payload = decode_token(token)
         assert payload is not None
         assert payload["sub"] == "123"
         assert payload["type"] == "access"
+        assert payload["jti"] == jti
 
     def test_decode_invalid_token(self):
         """Test decoding an invalid token returns None."""
         result = decode_token("invalid-token")
         assert result is None
 
-    def test_decode_tampered_token(self):
+    def test_decode_tampered_token(self, signed_access):
         """Test decoding a tampered token returns None."""
-        token, _ = create_access_token(subject=1)
+        token, _ = signed_access
         # Tamper with the token
         tampered = token[:-5] + "XXXXX"
         result = decode_token(tampered)
         assert result is None
 
-    def test_access_token_has_correct_type(self):
+    def test_access_token_has_correct_type(self, signed_access):
         """Test access token has type 'access'."""
-        token, _ = create_access_token(subject=1)
+        token, _ = signed_access
         payload = decode_token(token)
         assert payload["type"] == "access"
 
-    def test_refresh_token_has_correct_type(self):
+    def test_refresh_token_has_correct_type(self, signed_refresh):
         """Test refresh token has type 'refresh'."""
-        token, _ = create_refresh_token(subject=1)
+        token, _ = signed_refresh
         payload = decode_token(token)
         assert payload["type"] == "refresh"
 
@@ -143,6 +176,13 @@ class TestSecurityConfig:
         with pytest.raises(ValidationError):
             Settings(SECRET_KEY="your-super-secret-key-at-least-32-chars")
 
+    def test_get_settings_is_cached(self, settings):
+        """Test get_settings returns the module-level singleton."""
+        from app.core import config
+
+        assert config.get_settings() is settings
+        assert config.settings is settings
+
 
 class TestSetupLogging:
     """Tests for logging configuration."""
@@ -164,7 +204,6 @@ class TestSetupLogging:
         assert root_logger.level is not None
 
 
-@pytest.mark.asyncio
 async def test_root_endpoint(client):
     """Test root endpoint returns project name."""
     response = await client.get("/")
@@ -1,19 +1,22 @@
+import gzip
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compression import MAX_DECOMPRESSED_BODY_BYTES
 
-@pytest.fixture
-async def project_with_key(client: AsyncClient, auth_headers: dict) -> dict:
-    """Create a project and return its details including API key."""
-    response = await client.post(
-        "/api/v1/projects/",
-        headers=auth_headers,
-        json={"name": "Event Test Project"},
-    )
-    return response.json()
+
+@pytest.fixture(scope="module")
+async def project_with_key(module_db_session: AsyncSession, make_project) -> dict:
+    """Create one project (and owner) shared by the module, returning its API key.
+
+    Ingest tests never modify the project, so it is created once through the
+    service layer; events written by each test are still rolled back.
+    """
+    return await make_project(module_db_session, "events@example.com", "Event Test Project")
 
 
-@pytest.mark.asyncio
 async def test_ingest_single_event(client: AsyncClient, project_with_key: dict):
     """Test ingesting a single event."""
     response = await client.post(
@@ -34,7 +37,6 @@ async def test_ingest_single_event(client: AsyncClient, project_with_key: dict):
     assert response.json()["accepted"] == 1
 
 
-@pytest.mark.asyncio
 async def test_ingest_batch_events(client: AsyncClient, project_with_key: dict):
     """Test ingesting a batch of events."""
     events = [
@@ -51,7 +53,6 @@ async def test_ingest_batch_events(client: AsyncClient, project_with_key: dict):
     assert response.json()["accepted"] == 3
 
 
-@pytest.mark.asyncio
 async def test_ingest_with_invalid_api_key(client: AsyncClient):
     """Test ingesting events with an invalid API key."""
     response = await client.post(
@@ -62,7 +63,6 @@ async def test_ingest_with_invalid_api_key(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_ingest_without_api_key(client: AsyncClient):
     """Test ingesting events without an API key."""
     response = await client.post(
@@ -72,7 +72,6 @@ async def test_ingest_without_api_key(client: AsyncClient):
     assert response.status_code == 422  # Missing required header
 
 
-@pytest.mark.asyncio
 async def test_ingest_empty_events(client: AsyncClient, project_with_key: dict):
     """Test ingesting an empty events array fails validation."""
     response = await client.post(
@@ -83,7 +82,32 @@ async def test_ingest_empty_events(client: AsyncClient, project_with_key: dict):
     assert response.status_code == 422
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body,expected_status",
+    [
+        (b"not gzip at all", 400),
+        (gzip.compress(b'{"events": []}')[:-8], 400),  # truncated stream
+        (gzip.compress(b'{"events": []}') * 2, 400),  # second gzip member
+        (gzip.compress(b" " * (MAX_DECOMPRESSED_BODY_BYTES + 1)), 413),
+    ],
+    ids=["invalid", "truncated", "multi_member", "too_large"],
+)
+async def test_ingest_rejects_bad_gzip_body(
+    client: AsyncClient, project_with_key: dict, body: bytes, expected_status: int
+):
+    """Test gzip-encoded bodies that can't be decoded safely are rejected."""
+    response = await client.post(
+        "/api/v1/events/ingest",
+        headers={
+            "X-API-Key": project_with_key["api_key"],
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        },
+        content=body,
+    )
+    assert response.status_code == expected_status
+
+
 async def test_ingest_with_distinct_id(client: AsyncClient, project_with_key: dict):
     """Test ingesting events with user identification."""
     response = await client.post(
@@ -104,7 +128,6 @@ async def test_ingest_with_distinct_id(client: AsyncClient, project_with_key: di
     assert response.json()["accepted"] == 1
 
 
-@pytest.mark.asyncio
 async def test_ingest_with_timestamp(client: AsyncClient, project_with_key: dict):
     """Test ingesting events with custom timestamps."""
     response = await client.post(
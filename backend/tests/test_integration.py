@@ -1,17 +1,25 @@
 """Integration tests: full flow from event ingest to analytics queries."""
 
+import asyncio
+import gzip
+import json
+from collections.abc import Mapping
+from types import SimpleNamespace
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# Import models so Base.metadata.create_all creates all tables
-from app.models.event import Event  # noqa: F401
-from app.models.project import Project  # noqa: F401
-from app.models.user import User  # noqa: F401
+# Each test drives ingest and analytics through many requests
+pytestmark = pytest.mark.slow
 
 
 @pytest.fixture
-async def project_with_api_key(client: AsyncClient, auth_headers: dict) -> dict:
-    """Create a project and return its data along with auth headers."""
+async def project_with_api_key(
+    client: AsyncClient, auth_headers: Mapping[str, str]
+) -> SimpleNamespace:
+    """Create a project and return its ID and API key along with auth headers."""
     resp = await client.post(
         "/api/v1/projects/",
         headers=auth_headers,
@@ -19,19 +27,16 @@ async def project_with_api_key(client: AsyncClient, auth_headers: dict) -> dict:
     )
     assert resp.status_code == 201
     project = resp.json()
-    return {
-        "project": project,
-        "api_key": project["api_key"],
-        "auth_headers": auth_headers,
-    }
+    return SimpleNamespace(id=project["id"], api_key=project["api_key"], headers=auth_headers)
 
 
-@pytest.mark.asyncio
-async def test_full_ingest_to_analytics_flow(client: AsyncClient, project_with_api_key: dict):
+async def test_full_ingest_to_analytics_flow(
+    client: AsyncClient, project_with_api_key: SimpleNamespace
+):
     """End-to-end: ingest events via API key, then query all analytics endpoints."""
-    api_key = project_with_api_key["api_key"]
-    auth_headers = project_with_api_key["auth_headers"]
-    project_id = project_with_api_key["project"]["id"]
+    api_key = project_with_api_key.api_key
+    auth_headers = project_with_api_key.headers
+    project_id = project_with_api_key.id
 
     # Ingest a batch of diverse events
     events = [
@@ -81,64 +86,63 @@ async def test_full_ingest_to_analytics_flow(client: AsyncClient, project_with_a
     assert resp.status_code == 200
     assert resp.json()["accepted"] == 6
 
-    # -- Overview --
-    resp = await client.get(
-        f"/api/v1/analytics/{project_id}/overview?period=24h",
-        headers=auth_headers,
+    # The five analytics reads are independent, so issue them in one gather; the
+    # test session's lock in the get_db override still serializes them
+    base_url = f"/api/v1/analytics/{project_id}"
+    overview_r, top_r, ts_r, sess_r, users_r = await asyncio.gather(
+        client.get(f"{base_url}/overview?period=24h", headers=auth_headers),
+        client.get(f"{base_url}/top-events?period=24h", headers=auth_headers),
+        client.get(f"{base_url}/timeseries?period=24h&granularity=hourly", headers=auth_headers),
+        client.get(f"{base_url}/sessions?period=24h", headers=auth_headers),
+        client.get(f"{base_url}/users?period=24h", headers=auth_headers),
     )
-    assert resp.status_code == 200
-    overview = resp.json()
+
+    # -- Overview --
+    assert overview_r.status_code == 200
+    overview = overview_r.json()
     assert overview["total_events"] == 6
     assert overview["unique_sessions"] == 3
     assert overview["unique_users"] == 3
     assert overview["top_event"] == "page_view"  # 4 page_views
 
     # -- Top events --
-    resp = await client.get(
-        f"/api/v1/analytics/{project_id}/top-events?period=24h",
-        headers=auth_headers,
-    )
-    assert resp.status_code == 200
-    top_events = resp.json()["data"]
+    assert top_r.status_code == 200
+    top_events = top_r.json()["data"]
     assert len(top_events) == 3  # page_view, button_click, signup
     assert top_events[0]["event_name"] == "page_view"
     assert top_events[0]["count"] == 4
 
     # -- Timeseries --
-    resp = await client.get(
-        f"/api/v1/analytics/{project_id}/timeseries?period=24h&granularity=hourly",
-        headers=auth_headers,
-    )
-    assert resp.status_code == 200
-    ts = resp.json()
+    assert ts_r.status_code == 200
+    ts = ts_r.json()
     assert ts["granularity"] == "hourly"
     assert len(ts["data"]) > 0
     total_from_ts = sum(p["count"] for p in ts["data"])
     assert total_from_ts == 6
 
     # -- Sessions --
-    resp = await client.get(
-        f"/api/v1/analytics/{project_id}/sessions?period=24h",
-        headers=auth_headers,
-    )
-    assert resp.status_code == 200
-    sessions = resp.json()
+    assert sess_r.status_code == 200
+    sessions = sess_r.json()
     assert sessions["total"] == 3
     assert len(sessions["data"]) == 3
 
     # -- Users --
-    resp = await client.get(
-        f"/api/v1/analytics/{project_id}/users?period=24h",
-        headers=auth_headers,
-    )
-    assert resp.status_code == 200
-    users = resp.json()
+    assert users_r.status_code == 200
+    users = users_r.json()
     assert users["total"] == 3
     assert len(users["data"]) == 3
 
+    # -- Repeat reads with the returned ETags are answered 304 --
+    repeat = await asyncio.gather(
+        *(
+            client.get(r.request.url, headers={**auth_headers, "If-None-Match": r.headers["etag"]})
+            for r in (overview_r, top_r, ts_r, sess_r, users_r)
+        )
+    )
+    assert [r.status_code for r in repeat] == [304] * 5
+
 
-@pytest.mark.asyncio
-async def test_multiple_projects_isolation(client: AsyncClient, auth_headers: dict):
+async def test_multiple_projects_isolation(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Events in one project must not leak into another project's analytics."""
     # Create two projects
     resp1 = await client.post("/api/v1/projects/", headers=auth_headers, json={"name": "Project A"})
@@ -178,12 +182,11 @@ async def test_multiple_projects_isolation(client: AsyncClient, auth_headers: di
     assert resp.json()["total_events"] == 0
 
 
-@pytest.mark.asyncio
-async def test_ingest_then_rotate_key(client: AsyncClient, project_with_api_key: dict):
+async def test_ingest_then_rotate_key(client: AsyncClient, project_with_api_key: SimpleNamespace):
     """After rotating the API key, old key must fail and new key must work."""
-    old_api_key = project_with_api_key["api_key"]
-    auth_headers = project_with_api_key["auth_headers"]
-    project_id = project_with_api_key["project"]["id"]
+    old_api_key = project_with_api_key.api_key
+    auth_headers = project_with_api_key.headers
+    project_id = project_with_api_key.id
 
     # Ingest with old key
     resp = await client.post(
@@ -224,12 +227,13 @@ async def test_ingest_then_rotate_key(client: AsyncClient, project_with_api_key:
     assert resp.json()["total_events"] == 2
 
 
-@pytest.mark.asyncio
-async def test_large_batch_ingest(client: AsyncClient, project_with_api_key: dict):
-    """Test ingesting the maximum batch size (100 events)."""
-    api_key = project_with_api_key["api_key"]
-    auth_headers = project_with_api_key["auth_headers"]
-    project_id = project_with_api_key["project"]["id"]
+async def test_large_batch_ingest(
+    client: AsyncClient, db_session: AsyncSession, project_with_api_key: SimpleNamespace
+):
+    """Test ingesting the maximum batch size (100 events) as a gzip-encoded body."""
+    api_key = project_with_api_key.api_key
+    auth_headers = project_with_api_key.headers
+    project_id = project_with_api_key.id
 
     events = [
         {
@@ -241,13 +245,31 @@ async def test_large_batch_ingest(client: AsyncClient, project_with_api_key: dic
         for i in range(100)
     ]
 
-    resp = await client.post(
-        "/api/v1/events/ingest",
-        headers={"X-API-Key": api_key},
-        json={"events": events},
-    )
+    event_inserts = []
+
+    def count_event_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO events"):
+            event_inserts.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_event_inserts)
+    try:
+        # Large batches may be sent gzip-compressed
+        resp = await client.post(
+            "/api/v1/events/ingest",
+            headers={
+                "X-API-Key": api_key,
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            },
+            content=gzip.compress(json.dumps({"events": events}).encode()),
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_event_inserts)
     assert resp.status_code == 200
     assert resp.json()["accepted"] == 100
+    # The whole batch goes to the database as a single INSERT
+    assert len(event_inserts) == 1
 
     # Verify analytics reflect all 100 events
     resp = await client.get(
@@ -260,7 +282,6 @@ async def test_large_batch_ingest(client: AsyncClient, project_with_api_key: dic
     assert overview["unique_users"] == 10
 
 
-@pytest.mark.asyncio
 async def test_auth_flow_register_login_access(client: AsyncClient):
     """Full auth flow: register, login, access protected resource, verify identity."""
     email = "authflow@example.com"
@@ -1,41 +1,46 @@
+from collections.abc import Mapping
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
 
+@pytest.fixture(scope="module")
+async def created_project(module_db_session: AsyncSession, make_project) -> dict:
+    """One project shared by the module's read-only tests.
 
-@pytest.mark.asyncio
-async def test_create_project(client: AsyncClient, auth_headers: dict):
-    """Test creating a new project."""
-    response = await client.post(
-        "/api/v1/projects/",
-        headers=auth_headers,
-        json={"name": "My Website", "domain": "example.com"},
-    )
+    Its owner is a separate account from test_user, so auth_headers requests
+    exercise the "another user's project" paths against it.
+    """
+    return await make_project(module_db_session, "projectowner@example.com", "Test Project")
+
+
+@pytest.fixture
+async def owner_headers(created_project: dict, make_auth_headers) -> Mapping[str, str]:
+    """Auth headers for the owner of created_project."""
+    return await make_auth_headers(created_project["owner_id"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"name": "My Website", "domain": "example.com"},
+        {"name": "My App"},
+    ],
+    ids=["with_domain", "no_domain"],
+)
+async def test_create_project(client: AsyncClient, auth_headers: Mapping[str, str], payload: dict):
+    """Test creating a new project, with and without a domain."""
+    response = await client.post("/api/v1/projects/", headers=auth_headers, json=payload)
     assert response.status_code == 201
     data = response.json()
-    assert data["name"] == "My Website"
-    assert data["domain"] == "example.com"
+    assert data["name"] == payload["name"]
+    assert data["domain"] == payload.get("domain")
     assert data["api_key"].startswith("proj_")
     assert data["api_key_prefix"] == data["api_key"][:10]
     assert "id" in data
 
 
-@pytest.mark.asyncio
-async def test_create_project_no_domain(client: AsyncClient, auth_headers: dict):
-    """Test creating a project without a domain."""
-    response = await client.post(
-        "/api/v1/projects/",
-        headers=auth_headers,
-        json={"name": "My App"},
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert data["name"] == "My App"
-    assert data["domain"] is None
-
-
-@pytest.mark.asyncio
 async def test_create_project_unauthenticated(client: AsyncClient):
     """Test creating a project without auth fails."""
     response = await client.post(
@@ -45,8 +50,7 @@ async def test_create_project_unauthenticated(client: AsyncClient):
     assert response.status_code == 401
 
 
-@pytest.mark.asyncio
-async def test_list_projects(client: AsyncClient, auth_headers: dict):
+async def test_list_projects(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test listing user's projects."""
     # Create two projects
     await client.post(
@@ -71,17 +75,11 @@ async def test_list_projects(client: AsyncClient, auth_headers: dict):
         assert project["api_key_prefix"].startswith("proj_")
 
 
-@pytest.mark.asyncio
-async def test_get_project(client: AsyncClient, auth_headers: dict):
+async def test_get_project(
+    client: AsyncClient, created_project: dict, owner_headers: Mapping[str, str]
+):
     """Test getting a specific project."""
-    create_resp = await client.post(
-        "/api/v1/projects/",
-        headers=auth_headers,
-        json={"name": "Test Project"},
-    )
-    project_id = create_resp.json()["id"]
-
-    response = await client.get(f"/api/v1/projects/{project_id}", headers=auth_headers)
+    response = await client.get(f"/api/v1/projects/{created_project['id']}", headers=owner_headers)
     assert response.status_code == 200
     data = response.json()
     assert data["name"] == "Test Project"
@@ -90,26 +88,7 @@ async def test_get_project(client: AsyncClient, auth_headers: dict):
     assert data["api_key_prefix"] is not None
 
 
-@pytest.mark.asyncio
-async def test_get_other_users_project(
-    client: AsyncClient, auth_headers: dict, superuser: User, superuser_headers: dict
-):
-    """Test that a user cannot access another user's project."""
-    # Create project as superuser
-    create_resp = await client.post(
-        "/api/v1/projects/",
-        headers=superuser_headers,
-        json={"name": "Admin Project"},
-    )
-    project_id = create_resp.json()["id"]
-
-    # Try to access as regular user
-    response = await client.get(f"/api/v1/projects/{project_id}", headers=auth_headers)
-    assert response.status_code == 403
-
-
-@pytest.mark.asyncio
-async def test_update_project(client: AsyncClient, auth_headers: dict):
+async def test_update_project(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test updating a project."""
     create_resp = await client.post(
         "/api/v1/projects/",
@@ -132,8 +111,7 @@ async def test_update_project(client: AsyncClient, auth_headers: dict):
     assert data["api_key_prefix"] is not None
 
 
-@pytest.mark.asyncio
-async def test_delete_project(client: AsyncClient, auth_headers: dict):
+async def test_delete_project(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test deleting a project."""
     create_resp = await client.post(
         "/api/v1/projects/",
@@ -150,8 +128,7 @@ async def test_delete_project(client: AsyncClient, auth_headers: dict):
     assert response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_rotate_api_key(client: AsyncClient, auth_headers: dict):
+async def test_rotate_api_key(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test rotating a project's API key."""
     create_resp = await client.post(
         "/api/v1/projects/",
@@ -174,62 +151,44 @@ async def test_rotate_api_key(client: AsyncClient, auth_headers: dict):
     assert rotate_data["api_key_prefix"] == new_key[:10]
 
 
-@pytest.mark.asyncio
-async def test_get_nonexistent_project(client: AsyncClient, auth_headers: dict):
-    """Test getting a project that doesn't exist."""
-    response = await client.get("/api/v1/projects/99999", headers=auth_headers)
-    assert response.status_code == 404
-
-
-@pytest.mark.asyncio
-async def test_update_nonexistent_project(client: AsyncClient, auth_headers: dict):
-    """Test updating a project that doesn't exist returns 404."""
-    response = await client.patch(
-        "/api/v1/projects/99999",
-        headers=auth_headers,
-        json={"name": "Ghost"},
+@pytest.mark.parametrize(
+    "method,payload",
+    [("GET", None), ("PATCH", {"name": "Ghost"}), ("DELETE", None)],
+    ids=["get", "update", "delete"],
+)
+async def test_nonexistent_project(
+    client: AsyncClient, auth_headers: Mapping[str, str], method: str, payload: dict | None
+):
+    """Test reading, updating or deleting a project that doesn't exist returns 404."""
+    response = await client.request(
+        method, "/api/v1/projects/99999", headers=auth_headers, json=payload
     )
     assert response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_delete_nonexistent_project(client: AsyncClient, auth_headers: dict):
-    """Test deleting a project that doesn't exist returns 404."""
-    response = await client.delete("/api/v1/projects/99999", headers=auth_headers)
-    assert response.status_code == 404
-
-
-@pytest.mark.asyncio
-async def test_update_other_users_project(
-    client: AsyncClient, auth_headers: dict, superuser: User, superuser_headers: dict
+@pytest.mark.parametrize(
+    "method,suffix,payload",
+    [
+        ("GET", "", None),
+        ("PATCH", "", {"name": "Hacked"}),
+        ("DELETE", "", None),
+        ("POST", "/rotate-key", None),
+    ],
+    ids=["get", "update", "delete", "rotate_key"],
+)
+async def test_other_users_project_forbidden(
+    client: AsyncClient,
+    auth_headers: Mapping[str, str],
+    created_project: dict,
+    method: str,
+    suffix: str,
+    payload: dict | None,
 ):
-    """Test that a user cannot update another user's project."""
-    create_resp = await client.post(
-        "/api/v1/projects/",
-        headers=superuser_headers,
-        json={"name": "Admin Only"},
-    )
-    project_id = create_resp.json()["id"]
-
-    response = await client.patch(
-        f"/api/v1/projects/{project_id}",
+    """Test that a user cannot read, change or delete another user's project."""
+    response = await client.request(
+        method,
+        f"/api/v1/projects/{created_project['id']}{suffix}",
         headers=auth_headers,
-        json={"name": "Hacked"},
+        json=payload,
     )
     assert response.status_code == 403
-
-
-@pytest.mark.asyncio
-async def test_delete_other_users_project(
-    client: AsyncClient, auth_headers: dict, superuser: User, superuser_headers: dict
-):
-    """Test that a user cannot delete another user's project."""
-    create_resp = await client.post(
-        "/api/v1/projects/",
-        headers=superuser_headers,
-        json={"name": "Admin Protected"},
-    )
-    project_id = create_resp.json()["id"]
-
-    response = await client.delete(f"/api/v1/projects/{project_id}", headers=auth_headers)
-    assert response.status_code == 403
@@ -1,70 +1,96 @@
+from collections.abc import Mapping
+
 import pytest
 from httpx import AsyncClient
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
+from app.core.exceptions import ConflictError
+from app.core.security import verify_password
 from app.models.user import User
+from app.schemas.user import PasswordChange, PasswordReset
+from app.services.user_service import UserService
+from tests._seed import TEST_PASSWORD, TEST_USER_EMAIL
+from tests._utils import expect
+
+
+@pytest.fixture(scope="module")
+async def other_user(module_db_session: AsyncSession, insert_user) -> User:
+    """A second regular account, created once for the module's cross-user tests."""
+    user = await insert_user(module_db_session, "other@example.com", "Other User")
+    await module_db_session.commit()
+    return user
+
+
+@pytest.mark.parametrize(
+    "as_superuser,method,payload,expected",
+    [
+        (False, "GET", None, {"email": TEST_USER_EMAIL}),
+        (False, "PATCH", {"full_name": "Updated Name"}, {"full_name": "Updated Name"}),
+        (False, "PATCH", {"email": "newemail@example.com"}, {"email": "newemail@example.com"}),
+        (True, "GET", None, {"email": TEST_USER_EMAIL}),
+        (True, "PATCH", {"full_name": "Admin Updated Name"}, {"full_name": "Admin Updated Name"}),
+    ],
+    ids=["get_own", "update_own_name", "update_own_email", "superuser_get", "superuser_update"],
+)
+async def test_user_profile_access(
+    client: AsyncClient,
+    auth_headers: Mapping[str, str],
+    superuser_headers: Mapping[str, str],
+    test_user: User,
+    as_superuser: bool,
+    method: str,
+    payload: dict | None,
+    expected: dict,
+):
+    """Test a user, or a superuser, can read and update the user's profile."""
+    headers = superuser_headers if as_superuser else auth_headers
+    response = await client.request(
+        method, f"/api/v1/users/{test_user.id}", headers=headers, json=payload
+    )
+    data = expect(response, 200)
+    for field, value in expected.items():
+        assert data[field] == value
+
+
+@pytest.mark.parametrize(
+    "method,payload",
+    [("GET", None), ("PATCH", {"full_name": "Ghost"}), ("DELETE", None)],
+    ids=["get", "update", "delete"],
+)
+async def test_nonexistent_user_as_superuser(
+    client: AsyncClient, superuser_headers: Mapping[str, str], method: str, payload: dict | None
+):
+    """Test superuser gets 404 for reading, updating or deleting a non-existent user."""
+    response = await client.request(
+        method, "/api/v1/users/99999", headers=superuser_headers, json=payload
+    )
+    assert response.status_code == 404
 
 
-@pytest.mark.asyncio
-async def test_get_own_user(client: AsyncClient, auth_headers: dict, test_user: User):
-    """Test user can get their own profile."""
-    response = await client.get(f"/api/v1/users/{test_user.id}", headers=auth_headers)
-    assert response.status_code == 200
-    data = response.json()
-    assert data["email"] == test_user.email
-
-
-@pytest.mark.asyncio
-async def test_get_other_user_forbidden(client: AsyncClient, auth_headers: dict):
+async def test_get_other_user_forbidden(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test non-superuser cannot access other users' profiles (IDOR protection)."""
     response = await client.get("/api/v1/users/99999", headers=auth_headers)
     assert response.status_code == 404  # Returns 404 to not reveal user existence
 
 
-@pytest.mark.asyncio
-async def test_update_own_user(client: AsyncClient, auth_headers: dict, test_user: User):
-    """Test user can update their own profile."""
-    response = await client.patch(
-        f"/api/v1/users/{test_user.id}",
-        headers=auth_headers,
-        json={"full_name": "Updated Name"},
-    )
-    assert response.status_code == 200
-    assert response.json()["full_name"] == "Updated Name"
-
-
-@pytest.mark.asyncio
-async def test_list_users_requires_superuser(client: AsyncClient, auth_headers: dict):
+async def test_list_users_requires_superuser(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test listing users requires superuser privileges."""
     response = await client.get("/api/v1/users/", headers=auth_headers)
     assert response.status_code == 403
 
 
-@pytest.mark.asyncio
-async def test_list_users_as_superuser(client: AsyncClient, superuser_headers: dict):
+async def test_list_users_as_superuser(client: AsyncClient, superuser_headers: Mapping[str, str]):
     """Test superuser can list all users."""
     response = await client.get("/api/v1/users/", headers=superuser_headers)
-    assert response.status_code == 200
-    data = response.json()
+    data = expect(response, 200)
     assert "items" in data
     assert "total" in data
     assert "page" in data
 
 
-@pytest.mark.asyncio
-async def test_superuser_can_get_any_user(
-    client: AsyncClient, superuser_headers: dict, test_user: User
-):
-    """Test superuser can access any user's profile."""
-    response = await client.get(f"/api/v1/users/{test_user.id}", headers=superuser_headers)
-    assert response.status_code == 200
-    assert response.json()["email"] == test_user.email
-
-
-@pytest.mark.asyncio
 async def test_delete_user_as_superuser(
-    client: AsyncClient, superuser_headers: dict, test_user: User
+    client: AsyncClient, superuser_headers: Mapping[str, str], test_user: User
 ):
     """Test superuser can delete users."""
     response = await client.delete(f"/api/v1/users/{test_user.id}", headers=superuser_headers)
@@ -75,53 +101,26 @@ async def test_delete_user_as_superuser(
     assert response.status_code == 404
 
 
-@pytest.mark.asyncio
 async def test_delete_user_requires_superuser(
-    client: AsyncClient, auth_headers: dict, test_user: User
+    client: AsyncClient, auth_headers: Mapping[str, str], test_user: User
 ):
     """Test regular user cannot delete users."""
     response = await client.delete(f"/api/v1/users/{test_user.id}", headers=auth_headers)
     assert response.status_code == 403
 
 
-@pytest.mark.asyncio
-async def test_update_user_email(client: AsyncClient, auth_headers: dict, test_user: User):
-    """Test user can update their email."""
-    response = await client.patch(
-        f"/api/v1/users/{test_user.id}",
-        headers=auth_headers,
-        json={"email": "newemail@example.com"},
-    )
-    assert response.status_code == 200
-    assert response.json()["email"] == "newemail@example.com"
-
-
-@pytest.mark.asyncio
 async def test_update_user_email_conflict(
-    client: AsyncClient, auth_headers: dict, test_user: User, db_session: AsyncSession
+    db_session: AsyncSession, test_user: User, other_user: User
 ):
-    """Test updating to existing email fails."""
-    # Create another user
-    other_user = User(
-        email="existing@example.com",
-        hashed_password=hash_password("TestPassword123!"),
-        full_name="Other User",
-    )
-    db_session.add(other_user)
-    await db_session.commit()
-
-    # Try to update to existing email
-    response = await client.patch(
-        f"/api/v1/users/{test_user.id}",
-        headers=auth_headers,
-        json={"email": "existing@example.com"},
-    )
-    assert response.status_code == 409
+    """Test updating to an email another user has fails and keeps the old one."""
+    user = await db_session.get(User, test_user.id)
+    with pytest.raises(ConflictError):
+        await UserService(db_session).update_email(user, other_user.email)
+    assert user.email == test_user.email
 
 
-@pytest.mark.asyncio
 async def test_update_user_password_via_patch_ignored(
-    client: AsyncClient, auth_headers: dict, test_user: User
+    client: AsyncClient, auth_headers: Mapping[str, str], test_user: User
 ):
     """Test that password field in PATCH is ignored (must use /me/password)."""
     # Password field is not in UserUpdate schema, so it should be ignored
@@ -130,42 +129,37 @@ async def test_update_user_password_via_patch_ignored(
         headers=auth_headers,
         json={"password": "NewPassword456!", "full_name": "Updated"},
     )
-    assert response.status_code == 200
-    assert response.json()["full_name"] == "Updated"
+    assert expect(response, 200)["full_name"] == "Updated"
 
     # Verify the original password still works (password change was ignored)
     login_response = await client.post(
         "/api/v1/auth/login",
-        json={"email": test_user.email, "password": "TestPassword123!"},
+        json={"email": test_user.email, "password": TEST_PASSWORD},
     )
     assert login_response.status_code == 200
 
 
-@pytest.mark.asyncio
-async def test_change_password_success(client: AsyncClient, auth_headers: dict, test_user: User):
+async def test_change_password_success(
+    client: AsyncClient, auth_headers: Mapping[str, str], test_user: User, db_session: AsyncSession
+):
     """Test user can change password via dedicated endpoint."""
     response = await client.post(
         "/api/v1/users/me/password",
         headers=auth_headers,
         json={
-            "current_password": "TestPassword123!",
+            "current_password": TEST_PASSWORD,
             "new_password": "NewSecurePassword456!",
         },
     )
     assert response.status_code == 204
 
-    # Verify new password works
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": test_user.email, "password": "NewSecurePassword456!"},
-    )
-    assert login_response.status_code == 200
+    # The stored hash now matches the new password only
+    user = await db_session.get(User, test_user.id)
+    assert verify_password("NewSecurePassword456!", user.hashed_password)
+    assert not verify_password(TEST_PASSWORD, user.hashed_password)
 
 
-@pytest.mark.asyncio
-async def test_change_password_wrong_current(
-    client: AsyncClient, auth_headers: dict, test_user: User
-):
+async def test_change_password_wrong_current(client: AsyncClient, auth_headers: Mapping[str, str]):
     """Test password change fails with wrong current password."""
     response = await client.post(
         "/api/v1/users/me/password",
@@ -175,29 +169,25 @@ async def test_change_password_wrong_current(
             "new_password": "NewSecurePassword456!",
         },
     )
-    assert response.status_code == 400
-    assert "current password" in response.json()["detail"].lower()
+    assert "current password" in expect(response, 400)["detail"].lower()
 
 
-@pytest.mark.asyncio
-async def test_change_password_weak_new(client: AsyncClient, auth_headers: dict, test_user: User):
-    """Test password change fails with weak new password."""
-    response = await client.post(
-        "/api/v1/users/me/password",
-        headers=auth_headers,
-        json={
-            "current_password": "TestPassword123!",
-            "new_password": "weak",
-        },
-    )
-    assert response.status_code == 422  # Validation error
+@pytest.mark.parametrize(
+    "schema,fields",
+    [(PasswordChange, {"current_password": TEST_PASSWORD}), (PasswordReset, {})],
+    ids=["change", "reset"],
+)
+def test_password_schemas_reject_weak_new_password(schema: type[BaseModel], fields: dict):
+    """Test both password endpoints' schemas enforce the strength rules on new_password."""
+    with pytest.raises(ValidationError, match="at least 12 characters"):
+        schema(new_password="weak", **fields)
 
 
-@pytest.mark.asyncio
 async def test_superuser_reset_password(
     client: AsyncClient,
-    superuser_headers: dict,
+    superuser_headers: Mapping[str, str],
     test_user: User,
+    db_session: AsyncSession,
 ):
     """Test superuser can reset user password without current password."""
     response = await client.post(
@@ -207,32 +197,15 @@ async def test_superuser_reset_password(
     )
     assert response.status_code == 204
 
-    # Verify new password works
-    login_response = await client.post(
-        "/api/v1/auth/login",
-        json={"email": test_user.email, "password": "ResetPassword789!"},
-    )
-    assert login_response.status_code == 200
+    # The stored hash now matches the new password
+    user = await db_session.get(User, test_user.id)
+    assert verify_password("ResetPassword789!", user.hashed_password)
 
 
-@pytest.mark.asyncio
 async def test_regular_user_cannot_reset_others_password(
-    client: AsyncClient,
-    auth_headers: dict,
-    db_session: AsyncSession,
+    client: AsyncClient, auth_headers: Mapping[str, str], other_user: User
 ):
     """Test regular user cannot reset another user's password."""
-    # Create another user
-    other_user = User(
-        email="other_pw@example.com",
-        hashed_password=hash_password("TestPassword123!"),
-        full_name="Other User",
-    )
-    db_session.add(other_user)
-    await db_session.flush()
-    await db_session.refresh(other_user)
-    await db_session.commit()
-
     response = await client.post(
         f"/api/v1/users/{other_user.id}/password",
         headers=auth_headers,
@@ -241,23 +214,10 @@ async def test_regular_user_cannot_reset_others_password(
     assert response.status_code == 403
 
 
-@pytest.mark.asyncio
 async def test_update_other_user_forbidden(
-    client: AsyncClient, auth_headers: dict, db_session: AsyncSession
+    client: AsyncClient, auth_headers: Mapping[str, str], other_user: User
 ):
     """Test user cannot update other users' profiles."""
-    # Create another user
-    other_user = User(
-        email="other@example.com",
-        hashed_password=hash_password("TestPassword123!"),
-        full_name="Other User",
-    )
-    db_session.add(other_user)
-    await db_session.flush()
-    await db_session.refresh(other_user)
-    await db_session.commit()
-
-    # Try to update other user
     response = await client.patch(
         f"/api/v1/users/{other_user.id}",
         headers=auth_headers,
@@ -266,65 +226,39 @@ async def test_update_other_user_forbidden(
     assert response.status_code == 404  # Returns 404 to not reveal user existence
 
 
-@pytest.mark.asyncio
-async def test_superuser_update_any_user(
-    client: AsyncClient, superuser_headers: dict, test_user: User
-):
-    """Test superuser can update any user's profile."""
-    response = await client.patch(
-        f"/api/v1/users/{test_user.id}",
-        headers=superuser_headers,
-        json={"full_name": "Admin Updated Name"},
-    )
-    assert response.status_code == 200
-    assert response.json()["full_name"] == "Admin Updated Name"
-
-
-@pytest.mark.asyncio
-async def test_get_nonexistent_user_as_superuser(client: AsyncClient, superuser_headers: dict):
-    """Test superuser gets 404 for non-existent user."""
-    response = await client.get("/api/v1/users/99999", headers=superuser_headers)
-    assert response.status_code == 404
-
-
-@pytest.mark.asyncio
-async def test_update_nonexistent_user_as_superuser(client: AsyncClient, superuser_headers: dict):
-    """Test superuser gets 404 when updating non-existent user."""
-    response = await client.patch(
-        "/api/v1/users/99999",
-        headers=superuser_headers,
-        json={"full_name": "Ghost"},
-    )
-    assert response.status_code == 404
-
-
-@pytest.mark.asyncio
-async def test_delete_nonexistent_user(client: AsyncClient, superuser_headers: dict):
-    """Test deleting non-existent user returns 404."""
-    response = await client.delete("/api/v1/users/99999", headers=superuser_headers)
-    assert response.status_code == 404
-
-
-@pytest.mark.asyncio
 async def test_list_users_pagination(
-    client: AsyncClient, superuser_headers: dict, db_session: AsyncSession
+    client: AsyncClient,
+    superuser_headers: Mapping[str, str],
+    db_session: AsyncSession,
+    hashed_test_password: str,
 ):
     """Test list users pagination."""
     # Create multiple users
-    for i in range(5):
-        user = User(
+    db_session.add_all(
+        User(
             email=f"paguser{i}@example.com",
-            hashed_password=hash_password("TestPassword123!"),
+            hashed_password=hashed_test_password,
             full_name=f"Pagination User {i}",
         )
-        db_session.add(user)
+        for i in range(5)
+    )
     await db_session.commit()
 
     # Test first page
     response = await client.get("/api/v1/users/?page=1&per_page=2", headers=superuser_headers)
-    assert response.status_code == 200
-    data = response.json()
+    data = expect(response, 200)
     assert len(data["items"]) == 2
     assert data["page"] == 1
     assert data["per_page"] == 2
     assert data["total"] >= 5  # At least the 5 we created plus superuser
+
+    # Walk the remaining pages: together they must list every user exactly once
+    pages = [data]
+    for page in range(2, data["pages"] + 1):
+        response = await client.get(
+            f"/api/v1/users/?page={page}&per_page=2", headers=superuser_headers
+        )
+        pages.append(expect(response, 200))
+    emails = [user["email"] for page in pages for user in page["items"]]
+    assert len(emails) == len(set(emails)) == data["total"]
+    assert {f"paguser{i}@example.com" for i in range(5)} <= set(emails)